@@ -4,13 +4,116 @@ Download Project Gutenberg books using the Gutendex API.
 Downloads 100 English books with full metadata and text content.
 """
 
+import codecs
 import json
+import logging
+import math
 import os
-import re
 import requests
+import threading
 import time
-from pathlib import Path
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, suppress
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def json_loads(data: bytes):
+    """Parse JSON, using orjson when it is available."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def load_book(path: str) -> str:
+    """
+    Read a saved book, decompressing it if it was saved with zstd.
+
+    Args:
+        path: Path to a .txt or .txt.zst book file
+
+    Returns:
+        Book text content
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("zstandard is required to read compressed books")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode('utf-8')
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w', **kwargs):
+    """
+    Open a file for writing so that it only appears once fully written.
+
+    Data is written to a temporary file next to `path`, which replaces
+    `path` when the block exits without an error, so an interrupted run
+    never leaves a truncated file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how often requests may start."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
 
 
 class GutenbergDownloader:
@@ -18,15 +121,164 @@ class GutenbergDownloader:
 
     GUTENDEX_API = "https://gutendex.com/books"
     GUTENBERG_TEXT_URL = "https://www.gutenberg.org/files/{id}/{id}-0.txt"
+    USER_AGENT = "invenio-demo-gutenberg-downloader/1.0"
+    METADATA_WORKERS = 4
+    MARKER_SEARCH_CHARS = 16 * 1024
+    # Current ebooks carry a licence of well over 16 KB after the END marker
+    FOOTER_SEARCH_CHARS = 64 * 1024
+    CHUNK_SIZE = 64 * 1024
+    SNIFF_SIZE = 4 * 1024
+
+    # Characters that are not allowed in filenames
+    _FILENAME_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+
+    # Start/end markers of the actual book content, e.g.
+    # "*** START OF THE PROJECT GUTENBERG EBOOK PRIDE AND PREJUDICE ***"
+    _START_MARKERS = (
+        'START OF THIS PROJECT GUTENBERG EBOOK',
+        'START OF THE PROJECT GUTENBERG EBOOK',
+    )
+    _END_MARKERS = (
+        'END OF THIS PROJECT GUTENBERG EBOOK',
+        'END OF THE PROJECT GUTENBERG EBOOK',
+    )
 
-    def __init__(self, output_dir: str = "gutenberg_data"):
-        self.output_dir = Path(output_dir)
-        self.books_dir = self.output_dir / "books"
-        self.metadata_dir = self.output_dir / "metadata"
+    def __init__(
+        self,
+        output_dir: str = "gutenberg_data",
+        max_workers: int = 8,
+        rate: float = 2.0,
+        compress: bool = False,
+        pretty: bool = False
+    ):
+        self.output_dir = output_dir
+        self.books_dir = os.path.join(output_dir, "books")
+        self.metadata_dir = os.path.join(output_dir, "metadata")
+
+        # Optionally store book text zstd-compressed
+        if compress and zstandard is None:
+            raise ImportError("zstandard is required to save compressed books")
+        self.compress = compress
+        self.text_suffix = ".txt.zst" if compress else ".txt"
+
+        # Metadata is written as compact JSON unless asked to be indented
+        self.pretty = pretty
 
         # Create directories
-        self.books_dir.mkdir(parents=True, exist_ok=True)
-        self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(self.books_dir, exist_ok=True)
+        os.makedirs(self.metadata_dir, exist_ok=True)
+
+        # Downloads run concurrently, but new requests to gutenberg.org
+        # are started at no more than `rate` per second
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate)
+
+        # Shared session so connections to both hosts are kept alive and
+        # reused. The pool holds one connection per worker and blocks rather
+        # than opening extra connections that would be thrown away
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = self.USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(max_workers, self.METADATA_WORKERS),
+            pool_block=True,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+            ),
+        )
+        self.session.mount("https://gutendex.com", adapter)
+        self.session.mount("https://www.gutenberg.org", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
+    def _fetch_page(self, language: str, page: int) -> Dict:
+        """
+        Fetch a single page of results from the Gutendex API.
+
+        Args:
+            language: Language code
+            page: Page number, starting at 1
+
+        Returns:
+            Decoded API response
+        """
+        response = self.session.get(
+            self.GUTENDEX_API,
+            params={"languages": language, "page": page},
+            timeout=30
+        )
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    def _iter_pages(self, num_books: int, language: str) -> Iterator[List[Dict]]:
+        """
+        Fetch the pages of Gutendex results needed for `num_books` books.
+
+        Args:
+            num_books: Number of books wanted
+            language: Language code
+
+        Yields:
+            Lists of book metadata dictionaries, one per page, in page order
+        """
+        try:
+            first_page = self._fetch_page(language, 1)
+        except Exception as e:
+            logger.error("Error fetching metadata: %s", e)
+            return
+
+        yield first_page['results']
+
+        # The first page tells us how many pages are needed, so fetch the
+        # rest concurrently rather than following the "next" links
+        page_size = len(first_page['results'])
+        wanted = min(num_books, first_page.get('count', page_size))
+        if page_size and wanted > page_size:
+            pages_needed = math.ceil(wanted / page_size)
+            with ThreadPoolExecutor(max_workers=self.METADATA_WORKERS) as executor:
+                pages = executor.map(
+                    lambda page: self._fetch_page(language, page),
+                    range(2, pages_needed + 1)
+                )
+                try:
+                    for data in pages:
+                        yield data['results']
+                except Exception as e:
+                    logger.error("Error fetching metadata: %s", e)
+
+    def iter_metadata(self, num_books: int = 100, language: str = "en") -> Iterator[Dict]:
+        """
+        Fetch metadata for books from Gutendex API as it arrives.
+
+        Args:
+            num_books: Number of books to fetch
+            language: Language code (default: "en" for English)
+
+        Yields:
+            Book metadata dictionaries, as soon as their page is fetched
+        """
+        logger.info("Fetching metadata for %d %s books from Gutendex API...", num_books, language)
+
+        fetched = 0
+        for results in self._iter_pages(num_books, language):
+            # Trim to exact number requested
+            for book_meta in results[:num_books - fetched]:
+                fetched += 1
+                yield book_meta
+
+            logger.info("  Fetched %d books so far...", fetched)
+
+        logger.info("Successfully fetched metadata for %d books", fetched)
 
     def fetch_metadata(self, num_books: int = 100, language: str = "en") -> List[Dict]:
         """
@@ -39,34 +291,57 @@ class GutenbergDownloader:
         Returns:
             List of book metadata dictionaries
         """
-        print(f"Fetching metadata for {num_books} {language} books from Gutendex API...")
-
-        books = []
-        url = f"{self.GUTENDEX_API}?languages={language}"
+        return list(self.iter_metadata(num_books, language))
 
-        while len(books) < num_books and url:
-            try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
+    @staticmethod
+    def _is_marker(line: str, markers: tuple) -> bool:
+        """Check whether a line is one of the given Gutenberg markers."""
+        return line.lstrip(' \t*').upper().startswith(markers)
 
-                data = response.json()
-                books.extend(data['results'])
-                url = data.get('next')
+    @classmethod
+    def _find_start(cls, text: str, limit: int) -> Optional[int]:
+        """
+        Find the START marker within the first `limit` characters.
 
-                print(f"  Fetched {len(books)} books so far...")
-                time.sleep(1)  # Be polite to the API
+        Returns:
+            Offset just past the marker line, or None if not found
+        """
+        # Only look at complete lines
+        if limit < len(text):
+            limit = text.rfind('\n', 0, limit) + 1
 
-            except Exception as e:
-                print(f"Error fetching metadata: {e}")
-                break
+        pos = 0
+        for line in text[:limit].splitlines(keepends=True):
+            pos += len(line)
+            if cls._is_marker(line, cls._START_MARKERS):
+                return pos
 
-        # Trim to exact number requested
-        books = books[:num_books]
-        print(f"Successfully fetched metadata for {len(books)} books")
+        return None
 
-        return books
+    @classmethod
+    def _find_end(cls, text: str, offset: int) -> Optional[int]:
+        """
+        Find the last END marker at or after `offset`.
 
-    def strip_gutenberg_headers(self, text: str) -> str:
+        Returns:
+            Offset of the start of the marker line, or None if not found
+        """
+        # Only look at complete lines
+        if offset > 0 and text[offset - 1] != '\n':
+            offset = text.find('\n', offset) + 1
+            if not offset:
+                return None
+
+        pos = len(text)
+        for line in reversed(text[offset:].splitlines(keepends=True)):
+            pos -= len(line)
+            if cls._is_marker(line, cls._END_MARKERS):
+                return pos
+
+        return None
+
+    @classmethod
+    def strip_gutenberg_headers(cls, text: str) -> str:
         """
         Remove Project Gutenberg legal headers and footers.
 
@@ -76,38 +351,82 @@ class GutenbergDownloader:
         Returns:
             Cleaned book text
         """
-        # Find start of actual content
-        start_markers = [
-            r'\*\*\* START OF THIS PROJECT GUTENBERG EBOOK .+ \*\*\*',
-            r'\*\*\*START OF THE PROJECT GUTENBERG EBOOK .+ \*\*\*',
-            r'START OF THIS PROJECT GUTENBERG EBOOK',
-        ]
-
-        start_pos = 0
-        for marker in start_markers:
-            match = re.search(marker, text, re.IGNORECASE)
-            if match:
-                start_pos = match.end()
-                break
-
-        # Find end of actual content
-        end_markers = [
-            r'\*\*\* END OF THIS PROJECT GUTENBERG EBOOK .+ \*\*\*',
-            r'\*\*\*END OF THE PROJECT GUTENBERG EBOOK .+ \*\*\*',
-            r'END OF THIS PROJECT GUTENBERG EBOOK',
-        ]
-
-        end_pos = len(text)
-        for marker in end_markers:
-            match = re.search(marker, text, re.IGNORECASE)
-            if match:
-                end_pos = match.start()
-                break
+        # Find start of actual content - the marker is within the first few
+        # KB, so the window only grows (4x at a time) if it is missing there
+        window = cls.MARKER_SEARCH_CHARS
+        start = cls._find_start(text, window)
+        while start is None and window < len(text):
+            window *= 4
+            start = cls._find_start(text, window)
+        if start is None:
+            start = 0
+
+        # Find end of actual content - likewise within the last few tens of
+        # KB, after the licence text
+        window = cls.FOOTER_SEARCH_CHARS
+        end = cls._find_end(text, max(start, len(text) - window))
+        while end is None and len(text) - start > window:
+            window *= 4
+            end = cls._find_end(text, max(start, len(text) - window))
+        if end is None:
+            end = len(text)
 
         # Extract content and clean up
-        content = text[start_pos:end_pos].strip()
+        content = text[start:end].strip()
         return content
 
+    @staticmethod
+    def _sniff_encoding(head: bytes) -> str:
+        """
+        Guess the encoding of a book from the start of its raw text.
+
+        Uses a UTF-8 byte order mark or the "Character set encoding:" line
+        of the Gutenberg header, defaulting to UTF-8 since the "-0" text
+        files are the UTF-8 editions. A declared ASCII is read as UTF-8.
+        """
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+
+        pos = head.find(b'Character set encoding:')
+        if pos != -1:
+            line = head[pos:].split(b'\n', 1)[0]
+            declared = line.split(b':', 1)[1].strip().decode('ascii', 'ignore')
+            try:
+                encoding = codecs.lookup(declared).name
+            except LookupError:
+                encoding = None
+
+            # ASCII is a subset of UTF-8, and "ASCII" books often contain
+            # stray UTF-8 punctuation, so only honour declarations of
+            # encodings that actually decode differently
+            if encoding and encoding != 'ascii':
+                return encoding
+
+        return 'utf-8'
+
+    @classmethod
+    def _decode_chunks(cls, chunks: Iterable[bytes], errors: str = 'strict') -> str:
+        """
+        Decode a book from its raw body chunks as they arrive.
+
+        The encoding is sniffed from the first SNIFF_SIZE bytes, so the raw
+        body is never held in full alongside the decoded text.
+        """
+        chunks = iter(chunks)
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= cls.SNIFF_SIZE:
+                break
+
+        decoder = codecs.getincrementaldecoder(cls._sniff_encoding(head))(errors=errors)
+        pieces = [decoder.decode(head)]
+        for chunk in chunks:
+            pieces.append(decoder.decode(chunk))
+        pieces.append(decoder.decode(b'', final=True))
+
+        return ''.join(pieces)
+
     def download_book_text(self, book_id: int) -> Optional[str]:
         """
         Download the plain text content of a book.
@@ -121,14 +440,15 @@ class GutenbergDownloader:
         url = self.GUTENBERG_TEXT_URL.format(id=book_id)
 
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-
-            # Try to decode with UTF-8, fall back to latin-1
-            try:
-                text = response.content.decode('utf-8')
-            except UnicodeDecodeError:
-                text = response.content.decode('latin-1')
+            # Decode the body chunk by chunk as it streams in, in a single
+            # pass that replaces any invalid bytes rather than decoding the
+            # whole book again with another codec
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                text = self._decode_chunks(
+                    response.iter_content(chunk_size=self.CHUNK_SIZE),
+                    errors='replace'
+                )
 
             # Strip headers and footers
             clean_text = self.strip_gutenberg_headers(text)
@@ -136,14 +456,13 @@ class GutenbergDownloader:
             return clean_text
 
         except Exception as e:
-            print(f"  Error downloading book {book_id}: {e}")
+            logger.warning("Error downloading book %s: %s", book_id, e)
             return None
 
     def sanitize_filename(self, text: str, max_length: int = 100) -> str:
         """Create a safe filename from text."""
-        # Remove or replace invalid characters
-        text = re.sub(r'[<>:"/\\|?*]', '', text)
-        text = re.sub(r'\s+', '_', text)
+        # Remove invalid characters and replace whitespace runs with "_"
+        text = '_'.join(text.translate(self._FILENAME_TABLE).split())
         text = text.strip('._')
 
         # Limit length
@@ -171,25 +490,85 @@ class GutenbergDownloader:
         filename_base = f"{book_id}_{safe_title}"
 
         # Save text
-        text_path = self.books_dir / f"{filename_base}.txt"
+        text_path = f"{self.books_dir}/{filename_base}{self.text_suffix}"
         try:
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(book_text)
+            # Encode once and write the bytes in a single call rather than
+            # going through the incremental encoder of a text-mode file
+            data = book_text.encode('utf-8')
+            if self.compress:
+                # Compressors are not thread-safe, so use one per book
+                data = zstandard.ZstdCompressor(level=3).compress(data)
+            with atomic_open(text_path, 'wb') as f:
+                f.write(data)
         except Exception as e:
-            print(f"  Error saving text for {book_id}: {e}")
+            logger.warning("Error saving text for %s: %s", book_id, e)
             return False
 
         # Save metadata
-        metadata_path = self.metadata_dir / f"{filename_base}.json"
+        metadata_path = f"{self.metadata_dir}/{filename_base}.json"
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(book_metadata, f, indent=2, ensure_ascii=False)
+            with atomic_open(metadata_path, 'wb') as f:
+                f.write(json_dumps(book_metadata, self.pretty))
         except Exception as e:
-            print(f"  Error saving metadata for {book_id}: {e}")
+            logger.warning("Error saving metadata for %s: %s", book_id, e)
             return False
 
         return True
 
+    def find_downloaded(self) -> Set[int]:
+        """
+        Find the books already saved by a previous run.
+
+        Scans the books and metadata directories once each, so checking
+        whether a book can be skipped is a set lookup.
+
+        Returns:
+            IDs of books with a non-empty text file and its metadata file
+        """
+        with os.scandir(self.metadata_dir) as entries:
+            metadata_bases = {
+                entry.name[:-len(".json")]
+                for entry in entries
+                if entry.name.endswith(".json")
+            }
+
+        downloaded = set()
+        with os.scandir(self.books_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.text_suffix):
+                    continue
+
+                filename_base = entry.name[:-len(self.text_suffix)]
+                book_id, sep, _ = filename_base.partition('_')
+                if (sep and book_id.isdigit()
+                        and filename_base in metadata_bases
+                        and entry.stat().st_size > 0):
+                    downloaded.add(int(book_id))
+
+        return downloaded
+
+    def _fetch_and_save(self, book_meta: Dict) -> Optional[str]:
+        """
+        Download and save a single book.
+
+        Args:
+            book_meta: Book metadata dictionary
+
+        Returns:
+            None if successful, otherwise the reason for the failure
+        """
+        # Rate limiting - be respectful to the server
+        self.rate_limiter.acquire()
+
+        book_text = self.download_book_text(book_meta['id'])
+        if not book_text:
+            return "Download failed"
+
+        if not self.save_book(book_meta, book_text):
+            return "Save failed"
+
+        return None
+
     def download_all(self, num_books: int = 100, language: str = "en"):
         """
         Download books with metadata.
@@ -198,59 +577,72 @@ class GutenbergDownloader:
             num_books: Number of books to download
             language: Language code
         """
-        # Fetch metadata
-        books_metadata = self.fetch_metadata(num_books, language)
-
-        if not books_metadata:
-            print("No books found!")
-            return
-
-        # Download books
-        print(f"\nDownloading {len(books_metadata)} books...")
+        books_metadata = []
         successful = 0
+        skipped = 0
         failed = []
 
-        for i, book_meta in enumerate(books_metadata, 1):
-            book_id = book_meta['id']
-            title = book_meta.get('title', 'Unknown')
-
-            print(f"\n[{i}/{len(books_metadata)}] Downloading: {title} (ID: {book_id})")
-
-            # Download text
-            book_text = self.download_book_text(book_id)
-
-            if book_text:
-                # Save book and metadata
-                if self.save_book(book_meta, book_text):
-                    successful += 1
-                    print(f"  ✓ Saved successfully")
+        # Books saved by a previous run are not downloaded again
+        downloaded = self.find_downloaded()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Start downloading each page's books as soon as it arrives,
+            # while the following pages are still being fetched
+            futures = {}
+            for book_meta in self.iter_metadata(num_books, language):
+                books_metadata.append(book_meta)
+                if book_meta['id'] in downloaded:
+                    skipped += 1
+                    continue
+                futures[executor.submit(self._fetch_and_save, book_meta)] = book_meta
+
+            if not books_metadata:
+                logger.error("No books found!")
+                return
+
+            if skipped:
+                logger.info("\nSkipping %d books already downloaded", skipped)
+            logger.info("\nDownloading %d books...", len(futures))
+
+            for i, future in enumerate(as_completed(futures), 1):
+                book_meta = futures[future]
+                book_id = book_meta['id']
+                title = book_meta.get('title', 'Unknown')
+
+                error = future.result()
+                if error:
+                    failed.append((book_id, title, error))
+                    logger.warning(
+                        "[%d/%d] ✗ %s (ID: %s): %s",
+                        i, len(futures), title, book_id, error
+                    )
                 else:
-                    failed.append((book_id, title, "Save failed"))
-            else:
-                failed.append((book_id, title, "Download failed"))
-
-            # Rate limiting - be respectful to the server
-            time.sleep(2)
+                    successful += 1
+                    logger.info(
+                        "[%d/%d] ✓ %s (ID: %s)",
+                        i, len(futures), title, book_id
+                    )
 
         # Summary
-        print(f"\n{'='*60}")
-        print(f"Download Summary:")
-        print(f"  Successful: {successful}/{len(books_metadata)}")
-        print(f"  Failed: {len(failed)}")
+        logger.info("\n%s", "=" * 60)
+        logger.info("Download Summary:")
+        logger.info("  Successful: %d/%d", successful + skipped, len(books_metadata))
+        logger.info("  Already downloaded: %d", skipped)
+        logger.info("  Failed: %d", len(failed))
 
         if failed:
-            print(f"\nFailed downloads:")
+            logger.info("\nFailed downloads:")
             for book_id, title, reason in failed:
-                print(f"  - {book_id}: {title} ({reason})")
+                logger.info("  - %s: %s (%s)", book_id, title, reason)
 
         # Save master metadata file
-        master_metadata_path = self.output_dir / "all_books_metadata.json"
-        with open(master_metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(books_metadata, f, indent=2, ensure_ascii=False)
+        master_metadata_path = os.path.join(self.output_dir, "all_books_metadata.json")
+        with atomic_open(master_metadata_path, 'wb') as f:
+            f.write(json_dumps(books_metadata, self.pretty))
 
-        print(f"\nAll metadata saved to: {master_metadata_path}")
-        print(f"Books saved to: {self.books_dir}")
-        print(f"Individual metadata saved to: {self.metadata_dir}")
+        logger.info("\nAll metadata saved to: %s", master_metadata_path)
+        logger.info("Books saved to: %s", self.books_dir)
+        logger.info("Individual metadata saved to: %s", self.metadata_dir)
 
 
 def main():
@@ -276,11 +668,41 @@ def main():
         default='gutenberg_data',
         help='Output directory (default: gutenberg_data)'
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=8,
+        help='Number of concurrent downloads (default: 8)'
+    )
+    parser.add_argument(
+        '-r', '--rate',
+        type=float,
+        default=2.0,
+        help='Maximum book downloads started per second (default: 2.0)'
+    )
+    parser.add_argument(
+        '-z', '--compress',
+        action='store_true',
+        help='Save book text zstd-compressed as .txt.zst (requires zstandard)'
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write indented, human-readable metadata JSON files'
+    )
 
     args = parser.parse_args()
 
-    downloader = GutenbergDownloader(output_dir=args.output_dir)
-    downloader.download_all(num_books=args.num_books, language=args.language)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with GutenbergDownloader(
+        output_dir=args.output_dir,
+        max_workers=args.workers,
+        rate=args.rate,
+        compress=args.compress,
+        pretty=args.pretty
+    ) as downloader:
+        downloader.download_all(num_books=args.num_books, language=args.language)
 
 
 if __name__ == '__main__':
@@ -5,13 +5,28 @@ Reads metadata and text files from the Gutenberg download and creates InvenioRDM
 """
 
 import csv
+import functools
 import json
 import os
+import pickle
+import re
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from download_gutenberg_books import load_book
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     import pycountry
@@ -21,19 +36,123 @@ except ImportError:
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Matches the ID in descriptions like "Project Gutenberg eBook #84."
+_GUTENBERG_ID_RE = re.compile(r'Project Gutenberg eBook #(\d+)')
+
+
+def json_loads(data: bytes):
+    """Parse JSON, using orjson when it is available."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is available."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def iso639_1_to_3(lang_code: str) -> str:
+    """
+    Convert an ISO 639-1 (2-letter) language code to ISO 639-3 (3-letter).
+
+    Only a handful of distinct codes occur, so lookups are cached.
+
+    Args:
+        lang_code: Language code from Gutendex
+
+    Returns:
+        3-letter code, or the code unchanged if it cannot be converted
+    """
+    # Already 3-letter or pycountry not available
+    if not pycountry or len(lang_code) != 2:
+        return lang_code
+
+    try:
+        lang = pycountry.languages.get(alpha_2=lang_code)
+    except (AttributeError, KeyError):
+        return lang_code
+
+    # Fallback if not found
+    return lang.alpha_3 if lang else lang_code
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how often requests may start."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None):
+        """Change the refill rate, e.g. to follow server rate-limit headers."""
+        with self._lock:
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
 
 class InvenioUploader:
     """Upload books to InvenioRDM via REST API."""
 
+    PUBLICATION_CACHE = ".pub_years.pkl"
+    MAX_ATTEMPTS = 5
+    MIN_RATE = 0.1
+
+    # Constant parts of every record payload, built once and shared by all
+    # records create_metadata returns, which are therefore read-only
+    _RESOURCE_TYPE = {"id": "publication-book"}
+    _FORMATS = ["text/plain"]
+    _RIGHTS = [{
+        "title": {"en": "Public Domain"},
+        "description": {
+            "en": "This work is in the public domain in the United States."
+        },
+    }]
+    _OTHER_TYPE = {"id": "other"}
+
     def __init__(
         self,
         base_url: str = "https://127.0.0.1:5000",
         token_file: str = ".api_token",
-        data_dir: str = "gutenberg_data"
+        data_dir: str = "gutenberg_data",
+        max_workers: int = 4,
+        rate: float = 10.0
     ):
         self.base_url = base_url.rstrip('/')
         self.api_url = f"{self.base_url}/api"
         self.data_dir = Path(data_dir)
+        self.max_workers = max_workers
+
+        # API calls from all workers share one token bucket, which starts
+        # at `rate` requests per second and follows the server's limits
+        self.max_rate = rate
+        self.rate_limiter = RateLimiter(rate, capacity=max(1.0, rate))
 
         # Load API token
         token_path = Path(token_file)
@@ -49,9 +168,91 @@ class InvenioUploader:
             "Content-Type": "application/json",
         }
 
+        # Shared session so all API calls reuse pooled keep-alive connections
+        # and get the same retry/back-off policy. The pool holds a connection
+        # per worker plus one for listing records, and blocks rather than
+        # opening extra connections that would be thrown away
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = False  # Self-signed cert
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_workers + 1,
+            pool_block=True,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+            ),
+        )
+        self.session.mount(self.base_url, adapter)
+
+        # Gutenberg ID -> metadata file, built when records are first updated
+        self._metadata_index = None
+
         # Load publication years and Wikipedia URLs mapping
         self.publication_years, self.wikipedia_urls = self._load_publication_data()
 
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send an API request, respecting the server's rate limits.
+
+        Waits for the shared rate limiter before each attempt, adjusts the
+        rate from the X-RateLimit-* response headers and retries 429
+        responses after Retry-After (or exponential back-off).
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed on to the session
+
+        Returns:
+            The final response
+        """
+        # Rewind file bodies before retrying
+        body = kwargs.get('data')
+        body_pos = body.tell() if hasattr(body, 'seek') else None
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            self.rate_limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            self._adapt_rate(response)
+
+            if response.status_code != 429:
+                return response
+
+            if attempt < self.MAX_ATTEMPTS - 1:
+                retry_after = response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+                time.sleep(delay)
+
+                if body_pos is not None:
+                    body.seek(body_pos)
+
+        return response
+
+    def _adapt_rate(self, response: requests.Response):
+        """
+        Spread the requests the server still allows over its rate-limit window.
+
+        Args:
+            response: Response carrying X-RateLimit-Remaining/Reset headers
+        """
+        try:
+            remaining = int(response.headers['X-RateLimit-Remaining'])
+            reset = float(response.headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+
+        # Reset is usually an epoch timestamp, but may be given in seconds
+        if reset > 1e9:
+            reset -= time.time()
+
+        rate = remaining / max(reset, 1.0)
+        rate = min(self.max_rate, max(self.MIN_RATE, rate))
+        # Allow bursts of up to one second's worth of requests
+        self.rate_limiter.set_rate(rate, capacity=max(1.0, rate))
+
     def _load_publication_data(self) -> tuple:
         """
         Load publication years and Wikipedia URLs from CSV file.
@@ -66,33 +267,109 @@ class InvenioUploader:
             print("  Using fallback dates for all books.")
             return {}, {}
 
+        # Reuse the parsed mapping from a previous run if the CSV is unchanged
+        cache_file = self.data_dir / self.PUBLICATION_CACHE
+        csv_stat = pub_years_file.stat()
+        cache_key = (csv_stat.st_mtime_ns, csv_stat.st_size)
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, pub_years, wiki_urls = pickle.load(f)
+            if cached_key == cache_key:
+                print(f"Loaded {len(pub_years)} publication years and {len(wiki_urls)} Wikipedia URLs from {cache_file.name}")
+                return pub_years, wiki_urls
+        except Exception:
+            # Missing, stale-format or unreadable cache - parse the CSV
+            pass
+
         pub_years = {}
         wiki_urls = {}
         try:
-            with open(pub_years_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            with open(pub_years_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                id_col = header.index('gutenberg_id')
+                year_col = header.index('publication_year')
+                url_col = header.index('wikipedia_url') if 'wikipedia_url' in header else None
+
                 for row in reader:
                     try:
-                        gutenberg_id = int(row['gutenberg_id'])
-                        pub_year = int(row['publication_year'])
+                        gutenberg_id = int(row[id_col])
+                        pub_year = int(row[year_col])
                         pub_years[gutenberg_id] = pub_year
 
                         # Store Wikipedia URL if present
-                        wiki_url = row.get('wikipedia_url', '').strip()
-                        if wiki_url:
-                            wiki_urls[gutenberg_id] = wiki_url
-                    except (ValueError, KeyError):
+                        if url_col is not None and url_col < len(row):
+                            wiki_url = row[url_col].strip()
+                            if wiki_url:
+                                wiki_urls[gutenberg_id] = wiki_url
+                    except (ValueError, IndexError):
                         # Skip rows with invalid data
                         continue
 
             print(f"Loaded {len(pub_years)} publication years and {len(wiki_urls)} Wikipedia URLs from {pub_years_file.name}")
-            return pub_years, wiki_urls
 
         except Exception as e:
             print(f"Warning: Failed to load publication data: {e}")
             print("  Using fallback dates for all books.")
             return {}, {}
 
+        try:
+            tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((cache_key, pub_years, wiki_urls), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: Failed to cache publication data: {e}")
+
+        return pub_years, wiki_urls
+
+    @staticmethod
+    def _person(name: str, role: Optional[str] = None) -> Dict:
+        """
+        Build an InvenioRDM creator/contributor entry for a person.
+
+        Args:
+            name: Name in Gutenberg's "Last, First" format
+            role: Optional contributor role ID
+
+        Returns:
+            Creator or contributor dictionary
+        """
+        # Use full name as family name if no comma
+        family_name, _, given_name = name.partition(',')
+        family_name = family_name.strip()
+        given_name = given_name.strip()
+
+        person_or_org = {
+            "type": "personal",
+            "name": name,
+        }
+        if given_name:
+            person_or_org["given_name"] = given_name
+        if family_name:
+            person_or_org["family_name"] = family_name
+
+        person = {"person_or_org": person_or_org}
+        if role:
+            person["role"] = {"id": role}
+
+        return person
+
+    @staticmethod
+    def _print_error(message: str, e: Optional[Exception] = None):
+        """
+        Print an error from a worker, with the server's response if any.
+
+        The text and its newline are written in one call so that errors
+        from concurrent workers don't interleave.
+        """
+        if e is not None:
+            message = f"{message}: {e}"
+            response = getattr(e, 'response', None)
+            if response is not None:
+                message = f"{message}\n  Response: {response.text}"
+        print(f"  {message}\n", end='')
+
     def create_metadata(self, book_meta: Dict) -> Dict:
         """
         Convert Gutenberg metadata to InvenioRDM format.
@@ -101,35 +378,15 @@ class InvenioUploader:
             book_meta: Gutenberg book metadata from Gutendex
 
         Returns:
-            InvenioRDM-formatted metadata dictionary
+            InvenioRDM-formatted metadata dictionary. It shares its constant
+            parts (resource type, formats, rights) with every other record,
+            so treat it as read-only
         """
         # Extract authors
-        creators = []
-        for author in book_meta.get('authors', []):
-            author_name = author.get('name', 'Unknown Author')
-            # Parse "Last, First" format
-            if ',' in author_name:
-                parts = author_name.split(',', 1)
-                family_name = parts[0].strip()
-                given_name = parts[1].strip() if len(parts) > 1 else ""
-            else:
-                # Use full name as family name if no comma
-                family_name = author_name
-                given_name = ""
-
-            creator = {
-                "person_or_org": {
-                    "type": "personal",
-                    "name": author_name,
-                }
-            }
-
-            if given_name:
-                creator["person_or_org"]["given_name"] = given_name
-            if family_name:
-                creator["person_or_org"]["family_name"] = family_name
-
-            creators.append(creator)
+        creators = [
+            self._person(author.get('name', 'Unknown Author'))
+            for author in book_meta.get('authors', [])
+        ]
 
         # If no authors, use "Unknown"
         if not creators:
@@ -167,7 +424,7 @@ class InvenioUploader:
 
         # Create InvenioRDM metadata
         metadata = {
-            "resource_type": {"id": "publication-book"},
+            "resource_type": self._RESOURCE_TYPE,
             "title": book_meta.get('title', f"Book {book_meta.get('id')}"),
             "creators": creators,
             "publication_date": pub_date,
@@ -176,22 +433,9 @@ class InvenioUploader:
         # Add languages (convert ISO 639-1 to ISO 639-3)
         languages_list = book_meta.get('languages', [])
         if languages_list:
-            converted_langs = []
-            for lang_code in languages_list:
-                # Convert ISO 639-1 (2-letter) to ISO 639-3 (3-letter)
-                if pycountry and len(lang_code) == 2:
-                    try:
-                        lang = pycountry.languages.get(alpha_2=lang_code)
-                        if lang:
-                            converted_langs.append({"id": lang.alpha_3})
-                        else:
-                            # Fallback if not found
-                            converted_langs.append({"id": lang_code})
-                    except (AttributeError, KeyError):
-                        converted_langs.append({"id": lang_code})
-                else:
-                    # Already 3-letter or pycountry not available
-                    converted_langs.append({"id": lang_code})
+            converted_langs = [
+                {"id": iso639_1_to_3(lang_code)} for lang_code in languages_list
+            ]
 
             if converted_langs:
                 metadata["languages"] = converted_langs
@@ -214,83 +458,33 @@ class InvenioUploader:
             metadata["identifiers"] = identifiers
 
         # Add contributors (editors and translators)
-        contributors = []
-        for editor in book_meta.get('editors', []):
-            editor_name = editor.get('name', 'Unknown Editor')
-            # Parse "Last, First" format
-            if ',' in editor_name:
-                parts = editor_name.split(',', 1)
-                family_name = parts[0].strip()
-                given_name = parts[1].strip() if len(parts) > 1 else ""
-            else:
-                # Use full name as family name if no comma
-                family_name = editor_name
-                given_name = ""
-
-            contributor = {
-                "person_or_org": {
-                    "type": "personal",
-                    "name": editor_name,
-                },
-                "role": {"id": "editor"}
-            }
-
-            if given_name:
-                contributor["person_or_org"]["given_name"] = given_name
-            if family_name:
-                contributor["person_or_org"]["family_name"] = family_name
-
-            contributors.append(contributor)
-
-        for translator in book_meta.get('translators', []):
-            translator_name = translator.get('name', 'Unknown Translator')
-            # Parse "Last, First" format
-            if ',' in translator_name:
-                parts = translator_name.split(',', 1)
-                family_name = parts[0].strip()
-                given_name = parts[1].strip() if len(parts) > 1 else ""
-            else:
-                # Use full name as family name if no comma
-                family_name = translator_name
-                given_name = ""
-
-            contributor = {
-                "person_or_org": {
-                    "type": "personal",
-                    "name": translator_name,
-                },
-                "role": {"id": "other"}  # No "translator" role in vocabulary
-            }
-
-            if given_name:
-                contributor["person_or_org"]["given_name"] = given_name
-            if family_name:
-                contributor["person_or_org"]["family_name"] = family_name
-
-            contributors.append(contributor)
+        contributors = [
+            self._person(editor.get('name', 'Unknown Editor'), role="editor")
+            for editor in book_meta.get('editors', [])
+        ]
+        # No "translator" role in vocabulary
+        contributors += [
+            self._person(translator.get('name', 'Unknown Translator'), role="other")
+            for translator in book_meta.get('translators', [])
+        ]
 
         if contributors:
             metadata["contributors"] = contributors
 
         # Add format
-        metadata["formats"] = ["text/plain"]
+        metadata["formats"] = self._FORMATS
 
         # Add publisher
         metadata["publisher"] = "Project Gutenberg"
 
         # Add rights information
-        metadata["rights"] = [{
-            "title": {"en": "Public Domain"},
-            "description": {
-                "en": "This work is in the public domain in the United States."
-            },
-        }]
+        metadata["rights"] = self._RIGHTS
 
         # Add additional description with Project Gutenberg ID
         metadata["additional_descriptions"] = [{
-            "description": f"Project Gutenberg eBook #{book_meta.get('id')}. "
-                         f"Downloaded from https://www.gutenberg.org/ebooks/{book_meta.get('id')}",
-            "type": {"id": "other"}
+            "description": f"Project Gutenberg eBook #{book_id}. "
+                         f"Downloaded from https://www.gutenberg.org/ebooks/{book_id}",
+            "type": self._OTHER_TYPE
         }]
 
         # Add Wikipedia URL as a related identifier if available
@@ -300,7 +494,7 @@ class InvenioUploader:
                 "identifier": wiki_url,
                 "scheme": "url",
                 "relation_type": {"id": "describes"},
-                "resource_type": {"id": "other"}
+                "resource_type": self._OTHER_TYPE
             }]
 
         return metadata
@@ -327,18 +521,15 @@ class InvenioUploader:
         }
 
         try:
-            response = requests.post(
+            response = self._request(
+                "POST",
                 f"{self.api_url}/records",
-                headers=self.headers,
-                json=payload,
-                verify=False  # Self-signed cert
+                data=json_dumps(payload)
             )
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            print(f"  Error creating draft: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error creating draft for '{metadata.get('title')}'", e)
             return None
 
     def upload_file(self, record_id: str, filename: str, file_path: Path) -> bool:
@@ -348,7 +539,8 @@ class InvenioUploader:
         Args:
             record_id: Draft record ID
             filename: Name for the file
-            file_path: Path to the file to upload
+            file_path: Path to the file to upload, decompressed first if it
+                is a .zst book saved by download_gutenberg_books.py -z
 
         Returns:
             True if successful, False otherwise
@@ -356,42 +548,43 @@ class InvenioUploader:
         try:
             # Step 1: Initiate file upload
             init_payload = [{"key": filename}]
-            response = requests.post(
+            response = self._request(
+                "POST",
                 f"{self.api_url}/records/{record_id}/draft/files",
-                headers=self.headers,
-                json=init_payload,
-                verify=False
+                data=json_dumps(init_payload)
             )
             response.raise_for_status()
 
-            # Step 2: Upload file content
-            with open(file_path, 'rb') as f:
-                content_headers = {
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/octet-stream",
-                }
-                response = requests.put(
+            # Step 2: Upload file content, streamed from the open file
+            # rather than read into memory unless it has to be decompressed.
+            # The body is deliberately not gzip-encoded: the files API
+            # stores the request body as-is, so it would keep the
+            # compressed bytes as the file content
+            if file_path.suffix == '.zst':
+                content = nullcontext(load_book(str(file_path)).encode('utf-8'))
+            else:
+                content = open(file_path, 'rb')
+
+            with content as body:
+                response = self._request(
+                    "PUT",
                     f"{self.api_url}/records/{record_id}/draft/files/{filename}/content",
-                    headers=content_headers,
-                    data=f,
-                    verify=False
+                    headers={"Content-Type": "application/octet-stream"},
+                    data=body
                 )
                 response.raise_for_status()
 
             # Step 3: Commit the file
-            response = requests.post(
-                f"{self.api_url}/records/{record_id}/draft/files/{filename}/commit",
-                headers=self.headers,
-                verify=False
+            response = self._request(
+                "POST",
+                f"{self.api_url}/records/{record_id}/draft/files/{filename}/commit"
             )
             response.raise_for_status()
 
             return True
 
         except Exception as e:
-            print(f"  Error uploading file: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error uploading file {filename} to {record_id}", e)
             return False
 
     def publish_draft(self, record_id: str) -> Optional[Dict]:
@@ -405,78 +598,96 @@ class InvenioUploader:
             Published record response or None if failed
         """
         try:
-            response = requests.post(
-                f"{self.api_url}/records/{record_id}/draft/actions/publish",
-                headers=self.headers,
-                verify=False
+            response = self._request(
+                "POST",
+                f"{self.api_url}/records/{record_id}/draft/actions/publish"
             )
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            print(f"  Error publishing draft: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error publishing draft {record_id}", e)
             return None
 
-    def upload_book(self, book_metadata_file: Path) -> bool:
+    def prepare_book(self, book_metadata_file: Path) -> Optional[Tuple[Dict, Path, Dict]]:
         """
-        Upload a single book to InvenioRDM.
+        Load a book's metadata and build its InvenioRDM record, without
+        making any API calls.
 
         Args:
             book_metadata_file: Path to the book's metadata JSON file
 
         Returns:
-            True if successful, False otherwise
+            Tuple of (Gutenberg metadata, text file, InvenioRDM metadata),
+            or None if the book cannot be uploaded
         """
         # Load metadata
-        with open(book_metadata_file, 'r', encoding='utf-8') as f:
-            gutenberg_meta = json.load(f)
-
-        book_id = gutenberg_meta['id']
-        title = gutenberg_meta.get('title', f'Book {book_id}')
-
-        print(f"\nUploading: {title} (ID: {book_id})")
+        with open(book_metadata_file, 'rb') as f:
+            gutenberg_meta = json_loads(f.read())
 
-        # Find the corresponding text file
+        # Find the corresponding text file, which is zstd-compressed if the
+        # books were downloaded with -z
         base_name = book_metadata_file.stem  # Remove .json
         text_file = self.data_dir / "books" / f"{base_name}.txt"
+        if not text_file.exists():
+            text_file = text_file.with_name(f"{base_name}.txt.zst")
 
         if not text_file.exists():
-            print(f"  ✗ Text file not found: {text_file}")
-            return False
+            print(f"  ✗ Text file not found: {text_file.with_suffix('')}[.zst]")
+            return None
 
-        # Create metadata
-        print(f"  Creating draft record...")
-        invenio_metadata = self.create_metadata(gutenberg_meta)
-        draft = self.create_draft(invenio_metadata)
+        return gutenberg_meta, text_file, self.create_metadata(gutenberg_meta)
 
-        if not draft:
-            print(f"  ✗ Failed to create draft")
-            return False
+    def upload_book(self, book_metadata_file: Path) -> bool:
+        """
+        Upload a single book to InvenioRDM.
 
-        record_id = draft['id']
-        print(f"  ✓ Draft created (ID: {record_id})")
+        Args:
+            book_metadata_file: Path to the book's metadata JSON file
 
-        # Upload file
-        print(f"  Uploading text file...")
-        if not self.upload_file(record_id, f"{base_name}.txt", text_file):
-            print(f"  ✗ Failed to upload file")
+        Returns:
+            True if successful, False otherwise
+        """
+        prepared = self.prepare_book(book_metadata_file)
+        if not prepared:
             return False
 
-        print(f"  ✓ File uploaded")
+        return self.upload_prepared(*prepared)
 
-        # Publish
-        print(f"  Publishing record...")
-        published = self.publish_draft(record_id)
+    def upload_prepared(
+        self,
+        gutenberg_meta: Dict,
+        text_file: Path,
+        invenio_metadata: Dict
+    ) -> bool:
+        """
+        Create, fill and publish the record for a book prepared by
+        prepare_book.
 
-        if not published:
-            print(f"  ✗ Failed to publish")
+        Runs on the upload workers, so it only prints errors.
+
+        Args:
+            gutenberg_meta: Gutenberg book metadata from Gutendex
+            text_file: Path to the book's text file
+            invenio_metadata: InvenioRDM-formatted metadata
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # The draft, file and publish calls below run back-to-back on the
+        # session's pooled keep-alive connection, so only the first request
+        # of a worker pays for the TCP/TLS handshake. Progress is reported
+        # by upload_all, so this only prints errors
+        draft = self.create_draft(invenio_metadata)
+        if not draft:
             return False
 
-        record_url = f"{self.base_url}/records/{published['id']}"
-        print(f"  ✓ Published: {record_url}")
+        record_id = draft['id']
+        # Compressed books are uploaded as the plain text they contain
+        filename = text_file.stem if text_file.suffix == '.zst' else text_file.name
+        if not self.upload_file(record_id, filename, text_file):
+            return False
 
-        return True
+        return self.publish_draft(record_id) is not None
 
     def upload_all(self, limit: Optional[int] = None):
         """
@@ -505,16 +716,29 @@ class InvenioUploader:
         successful = 0
         failed = []
 
-        for i, metadata_file in enumerate(metadata_files, 1):
-            print(f"\n[{i}/{len(metadata_files)}]", end=" ")
+        # Upload several books at once, each worker handling one book's
+        # sequence of API calls at a time. Records are built here while
+        # the workers are busy with the uploads of earlier books
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for metadata_file in metadata_files:
+                prepared = self.prepare_book(metadata_file)
+                if not prepared:
+                    failed.append(metadata_file.stem)
+                    print(f"[{len(failed)}/{len(metadata_files)}] ✗ {metadata_file.stem}")
+                    continue
 
-            if self.upload_book(metadata_file):
-                successful += 1
-            else:
-                failed.append(metadata_file.stem)
+                future = executor.submit(self.upload_prepared, *prepared)
+                futures[future] = metadata_file
 
-            # Rate limiting - be nice to the server
-            time.sleep(1)
+            for i, future in enumerate(as_completed(futures), len(failed) + 1):
+                metadata_file = futures[future]
+                if future.result():
+                    successful += 1
+                    print(f"[{i}/{len(metadata_files)}] ✓ {metadata_file.stem}")
+                else:
+                    failed.append(metadata_file.stem)
+                    print(f"[{i}/{len(metadata_files)}] ✗ {metadata_file.stem}")
 
         # Summary
         print(f"\n{'='*60}")
@@ -529,51 +753,73 @@ class InvenioUploader:
 
         print(f"{'='*60}")
 
+    def _fetch_records_page(self, page: int, page_size: int) -> List[Dict]:
+        """
+        Fetch one page of Project Gutenberg records.
+
+        Args:
+            page: Page number, starting at 1
+            page_size: Number of records per page
+
+        Returns:
+            Record dictionaries on the page
+        """
+        url = f"{self.api_url}/records"
+        # Let the search index filter to Project Gutenberg books so
+        # other records are never transferred. A query switches the default
+        # sort to "bestmatch", where every hit ties and the page order is
+        # unstable; "newest" moves records that update_all re-publishes to
+        # the front, so the pages still to be fetched don't shift
+        params = {
+            "q": 'metadata.publisher:"Project Gutenberg"',
+            "sort": "newest",
+            "allversions": "false",
+            "size": page_size,
+            "page": page,
+        }
+
+        response = self._request(
+            "GET",
+            url,
+            params=params,
+            headers={"Accept": "application/json"}
+        )
+        response.raise_for_status()
+
+        data = json_loads(response.content)
+        return data.get('hits', {}).get('hits', [])
+
     def get_existing_records(self, page_size: int = 100):
         """
         Fetch existing records from the repository.
 
+        The next page is requested in the background while the records of
+        the current page are being processed.
+
         Args:
             page_size: Number of records per page
 
         Yields:
             Record dictionaries (only Project Gutenberg books)
         """
-        page = 1
-        while True:
-            try:
-                url = f"{self.api_url}/records"
-                params = {
-                    "size": page_size,
-                    "page": page,
-                }
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            next_page = executor.submit(self._fetch_records_page, page, page_size)
 
-                response = requests.get(
-                    url,
-                    params=params,
-                    headers={"Accept": "application/json"},
-                    verify=False
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                hits = data.get('hits', {}).get('hits', [])
+            while True:
+                try:
+                    hits = next_page.result()
+                except Exception as e:
+                    print(f"Error fetching records: {e}")
+                    break
 
                 if not hits:
                     break
 
-                for record in hits:
-                    # Only yield Project Gutenberg records
-                    publisher = record.get('metadata', {}).get('publisher', '')
-                    if publisher == 'Project Gutenberg':
-                        yield record
-
                 page += 1
-                time.sleep(0.5)  # Rate limiting
+                next_page = executor.submit(self._fetch_records_page, page, page_size)
 
-            except Exception as e:
-                print(f"Error fetching records: {e}")
-                break
+                yield from hits
 
     def extract_gutenberg_id(self, record: Dict) -> Optional[int]:
         """
@@ -588,14 +834,9 @@ class InvenioUploader:
         # Check additional_descriptions for Gutenberg ID
         metadata = record.get('metadata', {})
         for desc in metadata.get('additional_descriptions', []):
-            desc_text = desc.get('description', '')
-            if 'Project Gutenberg eBook #' in desc_text:
-                try:
-                    # Extract ID from text like "Project Gutenberg eBook #84."
-                    id_str = desc_text.split('#')[1].split('.')[0]
-                    return int(id_str)
-                except (IndexError, ValueError):
-                    continue
+            match = _GUTENBERG_ID_RE.search(desc.get('description', ''))
+            if match:
+                return int(match.group(1))
 
         return None
 
@@ -610,17 +851,14 @@ class InvenioUploader:
             New version draft or None if failed
         """
         try:
-            response = requests.post(
-                f"{self.api_url}/records/{record_id}/versions",
-                headers=self.headers,
-                verify=False
+            response = self._request(
+                "POST",
+                f"{self.api_url}/records/{record_id}/versions"
             )
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            print(f"  Error creating new version: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error creating new version of {record_id}", e)
             return None
 
     def import_files_from_previous_version(self, draft_id: str) -> bool:
@@ -634,17 +872,14 @@ class InvenioUploader:
             True if successful
         """
         try:
-            response = requests.post(
-                f"{self.api_url}/records/{draft_id}/draft/actions/files-import",
-                headers=self.headers,
-                verify=False
+            response = self._request(
+                "POST",
+                f"{self.api_url}/records/{draft_id}/draft/actions/files-import"
             )
             response.raise_for_status()
             return True
         except Exception as e:
-            print(f"  Error importing files: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error importing files into {draft_id}", e)
             return False
 
     def update_draft_metadata(self, draft_id: str, updated_metadata: Dict) -> bool:
@@ -661,24 +896,40 @@ class InvenioUploader:
         try:
             payload = {"metadata": updated_metadata}
 
-            response = requests.put(
+            response = self._request(
+                "PUT",
                 f"{self.api_url}/records/{draft_id}/draft",
-                headers=self.headers,
-                json=payload,
-                verify=False
+                data=json_dumps(payload)
             )
             response.raise_for_status()
             return True
         except Exception as e:
-            print(f"  Error updating draft: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"  Response: {e.response.text}")
+            self._print_error(f"Error updating draft {draft_id}", e)
             return False
 
+    def _index_metadata(self) -> Dict[int, Path]:
+        """
+        Map Gutenberg IDs to their metadata files.
+
+        Returns:
+            Dictionary of Gutenberg ID to metadata file path
+        """
+        index = {}
+        for metadata_file in (self.data_dir / "metadata").glob("*.json"):
+            # Files are named "<id>_<title>.json"
+            gutenberg_id, sep, _ = metadata_file.stem.partition('_')
+            if sep and gutenberg_id.isdigit():
+                index.setdefault(int(gutenberg_id), metadata_file)
+
+        return index
+
     def update_record(self, record: Dict) -> bool:
         """
         Update a single record with enhanced metadata.
 
+        Runs on the update workers, so it only prints errors; progress is
+        reported by update_all.
+
         Args:
             record: Existing record
 
@@ -686,69 +937,42 @@ class InvenioUploader:
             True if successful
         """
         record_id = record.get('id')
-        metadata = record.get('metadata', {})
-        title = metadata.get('title', 'Unknown')
-
-        print(f"\nUpdating: {title}")
-        print(f"  Record ID: {record_id}")
 
         # Extract Gutenberg ID
         gutenberg_id = self.extract_gutenberg_id(record)
         if not gutenberg_id:
-            print(f"  ✗ Could not extract Gutenberg ID, skipping")
+            self._print_error(f"Could not extract Gutenberg ID from {record_id}, skipping")
             return False
 
-        print(f"  Gutenberg ID: {gutenberg_id}")
-
         # Load corresponding Gutenberg metadata file
-        metadata_dir = self.data_dir / "metadata"
-        metadata_files = list(metadata_dir.glob(f"{gutenberg_id}_*.json"))
+        if self._metadata_index is None:
+            self._metadata_index = self._index_metadata()
+        metadata_file = self._metadata_index.get(gutenberg_id)
 
-        if not metadata_files:
-            print(f"  ✗ Gutenberg metadata file not found")
+        if not metadata_file:
+            self._print_error(f"No metadata file for Gutenberg ID {gutenberg_id} ({record_id})")
             return False
 
-        with open(metadata_files[0], 'r', encoding='utf-8') as f:
-            gutenberg_meta = json.load(f)
+        with open(metadata_file, 'rb') as f:
+            gutenberg_meta = json_loads(f.read())
 
         # Create enhanced metadata
         enhanced_metadata = self.create_metadata(gutenberg_meta)
 
-        # Create new version
-        print(f"  Creating new version...")
+        # Create a new version with the previous version's files and the
+        # enhanced metadata, then publish it
         new_draft = self.create_new_version(record_id)
         if not new_draft:
-            print(f"  ✗ Failed to create new version")
             return False
 
         draft_id = new_draft.get('id')
-        print(f"  ✓ New version draft created: {draft_id}")
-
-        # Import files from previous version
-        print(f"  Importing files from previous version...")
         if not self.import_files_from_previous_version(draft_id):
-            print(f"  ✗ Failed to import files")
             return False
 
-        print(f"  ✓ Files imported")
-
-        # Update metadata
-        print(f"  Updating metadata...")
         if not self.update_draft_metadata(draft_id, enhanced_metadata):
-            print(f"  ✗ Failed to update metadata")
-            return False
-
-        print(f"  ✓ Metadata updated")
-
-        # Publish
-        print(f"  Publishing...")
-        published = self.publish_draft(draft_id)
-        if not published:
-            print(f"  ✗ Failed to publish")
             return False
 
-        print(f"  ✓ Published successfully")
-        return True
+        return self.publish_draft(draft_id) is not None
 
     def update_all(self, limit: Optional[int] = None):
         """
@@ -762,24 +986,30 @@ class InvenioUploader:
         print(f"API: {self.api_url}")
         print(f"{'='*60}")
 
+        # Scan the metadata directory once rather than once per record
+        self._metadata_index = self._index_metadata()
+
         successful = 0
         failed = []
-        count = 0
 
-        for record in self.get_existing_records():
-            count += 1
-            if limit and count > limit:
-                break
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for record in self.get_existing_records():
+                if limit and len(futures) >= limit:
+                    break
+                futures[executor.submit(self.update_record, record)] = record
 
-            if self.update_record(record):
-                successful += 1
-            else:
+            for i, future in enumerate(as_completed(futures), 1):
+                record = futures[future]
                 record_id = record.get('id')
                 title = record.get('metadata', {}).get('title', 'Unknown')
-                failed.append((record_id, title))
 
-            # Rate limiting
-            time.sleep(1)
+                if future.result():
+                    successful += 1
+                    print(f"[{i}/{len(futures)}] ✓ {title} ({record_id})")
+                else:
+                    failed.append((record_id, title))
+                    print(f"[{i}/{len(futures)}] ✗ {title} ({record_id})")
 
         # Summary
         print(f"\n{'='*60}")
@@ -825,6 +1055,18 @@ def main():
         type=int,
         help='Limit number of books to process (default: all)'
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=4,
+        help='Number of books to upload or update concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '-r', '--rate',
+        type=float,
+        default=10.0,
+        help='Maximum API requests per second (default: 10.0)'
+    )
     parser.add_argument(
         '--update',
         action='store_true',
@@ -836,7 +1078,9 @@ def main():
     uploader = InvenioUploader(
         base_url=args.url,
         token_file=args.token_file,
-        data_dir=args.data_dir
+        data_dir=args.data_dir,
+        max_workers=args.workers,
+        rate=args.rate
     )
 
     if args.update: